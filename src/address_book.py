@@ -1,17 +1,24 @@
 """Core data structures for storing contacts, notes, and search logic."""
 
-from collections import UserDict
-from datetime import date, datetime
-import re
-from typing import List
+from calendar import isleap
+from collections import Counter
+from datetime import date
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from src.regex_patterns import BIRTHDAY_RE, EMAIL_RE, PHONE_RE
+
+# Called with the changed record and the search keys it lost and gained.
+RecordListener = Callable[["Record", Iterable[str], Iterable[str]], None]
 
 
 class Field:
     """Base class for typed value objects with common validation hooks."""
 
+    __slots__ = ("_value",)
+
     def __init__(self, value):
         """Create a field and immediately validate the provided value."""
-        self._value = None
         self.value = value
 
     @property
@@ -24,6 +31,16 @@ class Field:
         """Assign the field value; subclasses may override for validation."""
         self._value = value
 
+    def __eq__(self, other):
+        """Compare by stored value against another field or a raw value."""
+        if isinstance(other, Field):
+            return self._value == other._value
+        return self._value == other
+
+    def __hash__(self):
+        """Hash fields by their stored value so they match raw keys."""
+        return hash(self._value)
+
     def __str__(self):
         """Convert the value to string for display purposes."""
         return str(self.value)
@@ -32,123 +49,240 @@ class Field:
 class Name(Field):
     """Simple wrapper around the contact name value."""
 
+    __slots__ = ("_value_lower",)
+
+    @Field.value.setter
+    def value(self, value):
+        """Store the name along with its lowercased copy for searching."""
+        self._value = value
+        self._value_lower = value.lower()
+
+    @property
+    def value_lower(self):
+        """Return the lowercased name computed when it was assigned."""
+        return self._value_lower
+
 
 class Phone(Field):
     """Field responsible for validating and storing phone numbers."""
 
+    __slots__ = ()
+
     def __init__(self, value: str):
         """Validate and store a phone consisting of exactly 12 digits."""
         if not isinstance(value, str):
             raise ValueError("Phone number must be a string")
         cleaned_value = value.strip()
-        if cleaned_value.isdigit() and len(cleaned_value) == 12:
+        if PHONE_RE.match(cleaned_value):
             super().__init__(cleaned_value)
             return
         raise ValueError("Phone must contain 12 characters and only numbers")
 
+    def __str__(self):
+        """Return the validated phone string as is."""
+        return self._value
+
 
 class Email(Field):
     """Field that validates and stores email values."""
 
+    __slots__ = ("_value_lower",)
+
     def __init__(self, value: str):
         """Validate email value using a basic regex before storing."""
         if not isinstance(value, str):
             raise ValueError("Email must be a string")
         cleaned_value = value.strip()
-        regex_pattern = r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}$"
-        if re.fullmatch(regex_pattern, cleaned_value, flags=re.IGNORECASE):
+        if EMAIL_RE.fullmatch(cleaned_value):
             super().__init__(cleaned_value)
+            self._value_lower = cleaned_value.lower()
             return
         raise ValueError("Invalid email.")
 
+    @property
+    def value_lower(self):
+        """Return the lowercased email computed at validation time."""
+        return self._value_lower
+
+    def __str__(self):
+        """Return the validated email string as is."""
+        return self._value
+
 
 class Birthday(Field):
     """Field that stores birthday dates as `datetime.date` objects."""
 
+    __slots__ = ("_str",)
+
     def __init__(self, value: str):
-        """Parse a birthday string and ensure it is not a future date."""
+        """Parse a DD.MM.YYYY birthday and ensure it is not a future date."""
+        match = BIRTHDAY_RE.match(value) if isinstance(value, str) else None
+        if match is None:
+            raise ValueError("Invalid date format. Use DD.MM.YYYY")
+        day, month, year = (int(part) for part in match.groups())
         try:
-            birthday_date = datetime.strptime(value, "%d.%m.%Y").date()
+            birthday_date = date(year, month, day)
         except ValueError as exc:
             raise ValueError("Invalid date format. Use DD.MM.YYYY") from exc
-        if birthday_date > datetime.now().date():
+        if birthday_date > date.today():
             raise ValueError("Date must be in the past.")
         super().__init__(birthday_date)
+        self._str = (
+            f"{birthday_date.day:02d}."
+            f"{birthday_date.month:02d}."
+            f"{birthday_date.year:04d}"
+        )
 
     def __str__(self):
         """Return the birthday formatted back to DD.MM.YYYY."""
-        return self.value.strftime("%d.%m.%Y")
+        return self._str
 
 
 class Record:
     """Represents a contact and aggregates all related details."""
 
+    __slots__ = (
+        "name",
+        "phones",
+        "birthday",
+        "address",
+        "emails",
+        "listeners",
+    )
+
     def __init__(self, name: str):
         """Initialize a contact record with optional detail containers."""
         self.name = Name(name)
-        self.phones: List[Phone] = []
+        self.phones: Dict[str, Phone] = {}
         self.birthday: Birthday | None = None
         self.address: str | None = None
-        self.emails: List[Email] = []
+        self.emails: Dict[str, Email] = {}
+        self.listeners: List[RecordListener] = []
+
+    def notify_change(
+        self, removed: Iterable[str] = (), added: Iterable[str] = ()
+    ) -> None:
+        """Tell owning address books which search keys were swapped."""
+        for listener in self.listeners:
+            listener(self, removed, added)
 
     def add_phone(self, phone_number: str) -> None:
         """Attach a unique phone to the record."""
-        for phone in self.phones:
-            if phone_number == str(phone):
-                return
-        self.phones.append(Phone(phone_number))
+        phone = Phone(phone_number)
+        if phone.value in self.phones:
+            return
+        self.phones[phone.value] = phone
+        self.notify_change(added=(phone.value,))
 
-    def remove_phone(self, phone_number: str) -> None:
-        """Remove a matching phone number if it exists."""
-        for index, phone in enumerate(self.phones):
-            if phone_number == str(phone):
-                self.phones.pop(index)
+    def remove_phone(self, phone_number: str) -> bool:
+        """Remove a matching phone number; return whether it existed."""
+        if self.phones.pop(phone_number, None) is None:
+            return False
+        self.notify_change(removed=(phone_number,))
+        return True
 
     def edit_phone(self, old_phone_number: str, new_phone_number: str) -> None:
-        """Replace an existing phone with a new value."""
-        for index, phone in enumerate(self.phones):
-            if old_phone_number == str(phone):
-                self.phones[index] = Phone(new_phone_number)
+        """Replace an existing phone with a new value, keeping its position."""
+        if old_phone_number not in self.phones:
+            return
+        new_phone = Phone(new_phone_number)
+        added = () if new_phone.value in self.phones else (new_phone.value,)
+        self.phones = {
+            (new_phone.value if key == old_phone_number else key): (
+                new_phone if key == old_phone_number else phone
+            )
+            for key, phone in self.phones.items()
+        }
+        if new_phone.value != old_phone_number:
+            self.notify_change(removed=(old_phone_number,), added=added)
 
     def find_phone(self, phone_number: str) -> str | None:
         """Return the stored phone string if it exists."""
-        for phone in self.phones:
-            if phone_number == str(phone):
-                return phone_number
+        return phone_number if phone_number in self.phones else None
 
     def add_email(self, email_value: str) -> None:
-        """Attach a unique email address to the record."""
-        for email in self.emails:
-            if email_value == str(email):
-                return
-        self.emails.append(Email(email_value))
-
-    def remove_email(self, email_value: str) -> None:
-        """Delete an email address if present."""
-        for index, email in enumerate(self.emails):
-            if email_value == str(email):
-                self.emails.pop(index)
+        """Attach a unique (case-insensitive) email address to the record."""
+        email = Email(email_value)
+        if email.value_lower in self.emails:
+            return
+        self.emails[email.value_lower] = email
+        self.notify_change(added=(email.value_lower,))
+
+    def remove_email(self, email_value: str) -> bool:
+        """Delete an email address; return whether it was present."""
+        key = email_value.lower()
+        if self.emails.pop(key, None) is None:
+            return False
+        self.notify_change(removed=(key,))
+        return True
 
     def edit_email(self, old_email_value: str, new_email_value: str) -> None:
-        """Replace an existing email with a new one."""
-        for index, email in enumerate(self.emails):
-            if old_email_value == str(email):
-                self.emails[index] = Email(new_email_value)
+        """Replace an existing email with a new one, keeping its position."""
+        old_key = old_email_value.lower()
+        if old_key not in self.emails:
+            return
+        new_email = Email(new_email_value)
+        new_key = new_email.value_lower
+        added = () if new_key in self.emails else (new_key,)
+        self.emails = {
+            (new_key if key == old_key else key): (
+                new_email if key == old_key else email
+            )
+            for key, email in self.emails.items()
+        }
+        if new_key != old_key:
+            self.notify_change(removed=(old_key,), added=added)
 
     def find_email(self, email_value: str) -> str | None:
         """Return an email string if the record contains it."""
-        for email in self.emails:
-            if email_value == str(email):
-                return email_value
+        return email_value if email_value.lower() in self.emails else None
+
+    def __getstate__(self):
+        """Copy or pickle the record without the book-bound listeners."""
+        state = {slot: getattr(self, slot) for slot in self.__slots__}
+        state["listeners"] = []
+        return state
+
+    def __setstate__(self, state):
+        """Restore slot values from the copied or pickled state mapping."""
+        for slot, value in state.items():
+            setattr(self, slot, value)
 
     def add_birthday(self, birthday_value: str) -> None:
         """Assign a birthday to the contact."""
         self.birthday = Birthday(birthday_value)
+        self.notify_change()
+
+    def to_dict(self) -> dict:
+        """Convert the record details to JSON-friendly primitives."""
+        return {
+            "phones": list(self.phones),
+            "emails": [email.value for email in self.emails.values()],
+            "birthday": str(self.birthday) if self.birthday else None,
+            "address": self.address,
+        }
+
+    @classmethod
+    def from_dict(cls, name: str, data: dict) -> "Record":
+        """Rebuild a record from `to_dict` output, re-validating fields."""
+        contact_record = cls(name)
+        for phone in data.get("phones", []):
+            contact_record.add_phone(phone)
+        for email in data.get("emails", []):
+            contact_record.add_email(email)
+        if data.get("birthday"):
+            contact_record.add_birthday(data["birthday"])
+        contact_record.address = data.get("address")
+        return contact_record
 
     def __str__(self):
         """Provide a human-readable dump of the record fields."""
-        phones = "; ".join(phone.value for phone in self.phones) or "-"
-        emails = "; ".join(email.value for email in self.emails) or "-"
+        phones = "; ".join(
+            phone.value for phone in self.phones.values()
+        ) or "-"
+        emails = "; ".join(
+            email.value for email in self.emails.values()
+        ) or "-"
         address = self.address or "-"
         return (
             f"Contact name: {self.name.value}, "
@@ -161,114 +295,325 @@ class Record:
 class Congratulation:
     """Helper object describing when to congratulate a contact."""
 
-    def __init__(self, name: str, congratulation_date: str):
+    __slots__ = ("name", "congratulation_date")
+
+    def __init__(self, name: str, congratulation_date: date):
         """Store a congratulation reminder for a specific date."""
         self.name = name
         self.congratulation_date = congratulation_date
 
     def __str__(self):
         """Return a short label with name and congratulation date."""
-        return f"{self.name}: {self.congratulation_date}"
+        return f"{self.name}: {self.congratulation_date:%d.%m.%Y}"
 
     def __repr__(self):
         """Return a debug-friendly representation for the reminder."""
         return (
             f'Congratulation(name="{self.name}", '
-            f'congratulation_date="{self.congratulation_date}")'
+            f"congratulation_date={self.congratulation_date!r})"
         )
 
 
-class AddressBook(UserDict):
+class AddressBook(dict):
     """Dictionary-like container that manages contact records."""
 
+    def __init__(self, *args, **kwargs):
+        """Create the book together with its search and birthday indexes."""
+        super().__init__(*args, **kwargs)
+        self.__rebuild_index()
+
+    def copy(self) -> "AddressBook":
+        """Return a shallow copy with its own freshly built indexes."""
+        return self.__class__(self)
+
+    __copy__ = copy
+
+    def __reduce__(self):
+        """Pickle or deep-copy only the contacts; indexes are rebuilt."""
+        return (self.__class__, (dict(self),))
+
+    def to_dict(self) -> dict:
+        """Convert all contacts to a JSON-friendly mapping keyed by name."""
+        return {
+            name: contact_record.to_dict()
+            for name, contact_record in self.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AddressBook":
+        """Rebuild an address book from `to_dict` output."""
+        return cls(
+            (name, Record.from_dict(name, record_data))
+            for name, record_data in data.items()
+        )
+
+    def __setitem__(self, name: str, contact_record: Record) -> None:
+        """Store a contact under name and index it for search/birthdays."""
+        previous = self.get(name)
+        if previous is not None:
+            self.__unindex(name, previous)
+        super().__setitem__(name, contact_record)
+        self.__index_record(name, contact_record)
+
+    def __delitem__(self, name: str) -> None:
+        """Remove a contact together with its index postings."""
+        contact_record = self[name]
+        super().__delitem__(name)
+        self.__forget(name, contact_record)
+
+    def pop(self, name: str, *default):
+        """Remove and return a contact, keeping the indexes in sync."""
+        if name not in self:
+            if default:
+                return default[0]
+            raise KeyError(name)
+        contact_record = self[name]
+        del self[name]
+        return contact_record
+
+    def popitem(self) -> Tuple[str, Record]:
+        """Remove and return the last stored contact and its name."""
+        name, contact_record = super().popitem()
+        self.__forget(name, contact_record)
+        return name, contact_record
+
+    def setdefault(self, name: str, default: Record = None) -> Record:
+        """Return the contact for name, storing default if it is missing."""
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args, **kwargs) -> None:
+        """Store every given contact through the indexing __setitem__."""
+        for name, contact_record in dict(*args, **kwargs).items():
+            self[name] = contact_record
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self) -> None:
+        """Remove every contact and reset the indexes."""
+        for name, contact_record in self.items():
+            self.__unsubscribe(name, contact_record)
+        super().clear()
+        self.__rebuild_index()
+
     def add_record(self, contact_record: Record) -> None:
         """Store or replace a contact by its name key."""
-        self.data[str(contact_record.name)] = contact_record
+        self[str(contact_record.name)] = contact_record
 
     def find(self, name: str) -> Record | None:
         """Return the contact record matching the provided name."""
-        return self.data.get(name)
+        return self.get(name)
 
     def delete(self, name: str) -> Record | None:
         """Remove a contact entry and return it if found."""
-        return self.data.pop(name, None)
-
-    def __get_birthday_this_year(
-        self, birthday: date, year: int
-    ) -> date | None:
-        """Return this year's birthday date (handles leap years)."""
-        try:
-            return date(year, birthday.month, birthday.day)
-        except ValueError:
-            if birthday.month == 2 and birthday.day == 29:
-                return date(year, 2, 28)
-            return None
-
-    def __get_next_birthday(
-        self, birthday: date, today: date
-    ) -> date | None:
-        """Determine the next birthday date relative to `today`."""
-        birthday_this_year = self.__get_birthday_this_year(
-            birthday, today.year
+        return self.pop(name, None)
+
+    def __rebuild_index(self) -> None:
+        """Index every stored contact from scratch."""
+        self._trigrams: Dict[str, Set[str]] = {}
+        # Per contact: trigram -> number of its fields containing it.
+        self._record_trigrams: Dict[str, Dict[str, int]] = {}
+        self._search_texts: Dict[str, str] = {}
+        self._birthdays: Dict[Tuple[int, int], Set[str]] = {}
+        self._record_birthdays: Dict[str, Tuple[int, int]] = {}
+        self._listeners: Dict[str, RecordListener] = {}
+        self._order: Dict[str, int] = {}
+        self._next_order = 0
+        for name, contact_record in self.items():
+            self.__index_record(name, contact_record)
+
+    @staticmethod
+    def __get_trigrams(text: str) -> Set[str]:
+        """Split text into the set of its overlapping 3-character slices."""
+        return {text[index:index + 3] for index in range(len(text) - 2)}
+
+    @staticmethod
+    def __get_search_text(contact_record: Record) -> str:
+        """Join the lowercased name, phone and email keys of a contact."""
+        # Phones and emails are keyed by their digits / lowercased value.
+        # NUL never appears in typed queries, so matches cannot span fields.
+        return "\0".join(
+            [
+                contact_record.name.value_lower,
+                *contact_record.phones,
+                *contact_record.emails,
+            ]
         )
-        if birthday_this_year and birthday_this_year >= today:
-            return birthday_this_year
-        birthday_next_year = self.__get_birthday_this_year(
-            birthday,
-            today.year + 1,
+
+    def __add_field(self, name: str, field: str) -> None:
+        """Post the trigrams of one searchable field of a contact."""
+        counts = self._record_trigrams[name]
+        for trigram in self.__get_trigrams(field):
+            if trigram in counts:
+                counts[trigram] += 1
+            else:
+                counts[trigram] = 1
+                self._trigrams.setdefault(trigram, set()).add(name)
+
+    def __discard_field(self, name: str, field: str) -> None:
+        """Withdraw the trigrams of one searchable field of a contact."""
+        counts = self._record_trigrams[name]
+        for trigram in self.__get_trigrams(field):
+            count = counts.get(trigram, 0)
+            if count > 1:
+                counts[trigram] = count - 1
+            elif count == 1:
+                del counts[trigram]
+                names = self._trigrams[trigram]
+                names.discard(name)
+                if not names:
+                    del self._trigrams[trigram]
+
+    def __index_birthday(self, name: str, contact_record: Record) -> None:
+        """Move the contact to the posting of its current birthday."""
+        month_day = None
+        if contact_record.birthday is not None:
+            birthday = contact_record.birthday.value
+            month_day = (birthday.month, birthday.day)
+        previous = self._record_birthdays.get(name)
+        if previous == month_day:
+            return
+        if previous is not None:
+            names = self._birthdays[previous]
+            names.discard(name)
+            if not names:
+                del self._birthdays[previous]
+            del self._record_birthdays[name]
+        if month_day is not None:
+            self._birthdays.setdefault(month_day, set()).add(name)
+            self._record_birthdays[name] = month_day
+
+    def __unsubscribe(self, name: str, contact_record: Record) -> None:
+        """Stop listening to changes of the contact stored under name."""
+        listener = self._listeners.pop(name, None)
+        if listener is not None:
+            contact_record.listeners.remove(listener)
+
+    def __unindex(self, name: str, contact_record: Record) -> None:
+        """Drop every index posting that points at the given contact."""
+        self.__unsubscribe(name, contact_record)
+        self._search_texts.pop(name, None)
+        for trigram in self._record_trigrams.pop(name, ()):
+            names = self._trigrams[trigram]
+            names.discard(name)
+            if not names:
+                del self._trigrams[trigram]
+        month_day = self._record_birthdays.pop(name, None)
+        if month_day is not None:
+            names = self._birthdays[month_day]
+            names.discard(name)
+            if not names:
+                del self._birthdays[month_day]
+
+    def __forget(self, name: str, contact_record: Record) -> None:
+        """Finish removing a contact that is no longer stored."""
+        self.__unindex(name, contact_record)
+        del self._order[name]
+
+    def __index_record(self, name: str, contact_record: Record) -> None:
+        """Build the search and birthday postings for a stored contact."""
+        if name not in self._order:
+            self._order[name] = self._next_order
+            self._next_order += 1
+
+        search_text = self.__get_search_text(contact_record)
+        counts = Counter(
+            chain.from_iterable(
+                map(self.__get_trigrams, search_text.split("\0"))
+            )
         )
-        return birthday_next_year
+        self._record_trigrams[name] = counts
+        postings_setdefault = self._trigrams.setdefault
+        for trigram in counts:
+            postings_setdefault(trigram, set()).add(name)
+        self._search_texts[name] = search_text
+        self.__index_birthday(name, contact_record)
+
+        def listener(
+            changed: Record, removed: Iterable[str], added: Iterable[str]
+        ) -> None:
+            self.__on_record_change(name, changed, removed, added)
+
+        self._listeners[name] = listener
+        contact_record.listeners.append(listener)
+
+    def __on_record_change(
+        self,
+        name: str,
+        contact_record: Record,
+        removed: Iterable[str],
+        added: Iterable[str],
+    ) -> None:
+        """Apply only the changed fields of a contact to the indexes."""
+        if removed or added:
+            for field in removed:
+                self.__discard_field(name, field)
+            for field in added:
+                self.__add_field(name, field)
+            self._search_texts[name] = self.__get_search_text(contact_record)
+        self.__index_birthday(name, contact_record)
+
+    def __get_birthday_window(
+        self, today: date, count_days: int
+    ) -> Dict[Tuple[int, int], date]:
+        """Map every (month, day) to its next date within the window.
+
+        A birthday always recurs within 366 days, so the window is capped
+        there. Feb 29 birthdays fall back to Feb 28 in non-leap years.
+        """
+        window: Dict[Tuple[int, int], date] = {}
+        today_ordinal = today.toordinal()
+        for offset in range(min(count_days, 366) + 1):
+            day = date.fromordinal(today_ordinal + offset)
+            window.setdefault((day.month, day.day), day)
+            if day.month == 2 and day.day == 28 and not isleap(day.year):
+                window.setdefault((2, 29), day)
+        return window
 
     def get_upcoming_birthdays(
-        self, count_days: int = 7
+        self, count_days: int = 7, today: Optional[date] = None
     ) -> List[Congratulation]:
         """Collect congratulation reminders for birthdays within the window."""
-        today = datetime.today().date()
-        result: List[Congratulation] = []
-
-        for name in self.data:
-            contact_record = self.data[name]
-            if not isinstance(contact_record.birthday, Birthday):
-                continue
-            birthday = contact_record.birthday.value
-            if not birthday:
-                continue
-
-            birthday_date = self.__get_next_birthday(birthday, today)
-            if not birthday_date:
-                continue
-
-            delta_days = (birthday_date - today).days
-            if 0 <= delta_days <= count_days:
-                result.append(
-                    Congratulation(
-                        name,
-                        birthday_date.strftime("%d.%m.%Y"),
-                    )
-                )
-
-        return result
+        if today is None:
+            today = date.today()
+        window = self.__get_birthday_window(today, count_days)
+        birthdays_get = self._birthdays.get
+        upcoming: List[Tuple[str, date]] = []
+
+        for month_day, birthday_date in window.items():
+            for name in birthdays_get(month_day, ()):
+                upcoming.append((name, birthday_date))
+
+        upcoming.sort(key=lambda item: self._order[item[0]])
+        return [
+            Congratulation(name, birthday_date)
+            for name, birthday_date in upcoming
+        ]
+
+    def __get_candidates(self, query_lower: str) -> Iterable[str]:
+        """Narrow contact names down using the trigram index when possible."""
+        trigrams = self.__get_trigrams(query_lower)
+        if not trigrams:
+            return self.keys()
+        postings = sorted(
+            (self._trigrams.get(trigram, set()) for trigram in trigrams),
+            key=len,
+        )
+        names = set.intersection(*postings)
+        return sorted(names, key=self._order.get)
 
     def search(self, query: str) -> List[Record]:
         """Find contacts whose name, phone, or email contains the query."""
-        contacts = []
-        for contact_record in self.data.values():
-            if query.lower() in contact_record.name.value.lower():
-                contacts.append(contact_record)
-                continue
-            contact_by_phone = None
-            for phone in contact_record.phones:
-                if query in phone.value:
-                    contact_by_phone = contact_record
-                    break
-            if contact_by_phone:
-                contacts.append(contact_by_phone)
-                continue
-            for email in contact_record.emails:
-                if query.lower() in email.value.lower():
-                    contacts.append(contact_record)
-                    break
-        return contacts
+        query_lower = query.lower()
+        search_texts = self._search_texts
+        return [
+            self[name]
+            for name in self.__get_candidates(query_lower)
+            if query_lower in search_texts[name]
+        ]
 
 
 if __name__ == "__main__":
@@ -294,7 +639,7 @@ if __name__ == "__main__":
     book.add_record(jane_record)
 
     # Виведення всіх записів у книзі
-    for contact in book.data.values():
+    for contact in book.values():
         print(contact)
 
     print(book.get_upcoming_birthdays())
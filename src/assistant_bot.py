@@ -1,65 +1,56 @@
 """Assistant bot orchestration module."""
 
+import time
+
 from src.address_book import AddressBook
 from src.assistant_bot_cli import AssistantCLI, Command
 from src.assistant_bot_handlers import AssistantBotHandlers
 from src.assistant_bot_storage import AssistantBotStorage
 from src.notes import Notes
 
+__all__ = ["init_bot"]
 
-def init_bot():
-    """Run the assistant bot CLI loop."""
-    cli = AssistantCLI()
-    storage = AssistantBotStorage()
-    book, notes = storage.load_data() or (AddressBook(), Notes())
-    handlers = AssistantBotHandlers(book, notes)
 
-    command_actions = {
-        Command.ADD: (handlers.add_contact, True, cli.success_color),
-        Command.DELETE: (handlers.delete_contact, True, cli.info_color),
-        Command.SEARCH: (handlers.search_contact, True, cli.info_color),
-        Command.ADD_EMAIL: (handlers.add_email, True, cli.success_color),
-        Command.EMAILS: (handlers.show_emails, True, cli.warning_color),
-        Command.CHANGE_EMAIL: (handlers.change_email, True, cli.success_color),
-        Command.SET_ADDRESS: (handlers.set_address, True, cli.success_color),
-        Command.CHANGE_PHONE: (handlers.change_phone, True, cli.success_color),
-        Command.PHONES: (handlers.show_phones, True, cli.warning_color),
-        Command.ALL: (handlers.show_all, False, cli.warning_color),
-        Command.ADD_BIRTHDAY: (handlers.add_birthday, True, cli.success_color),
-        Command.SHOW_BIRTHDAY: (
-            handlers.show_birthday,
-            True,
-            cli.warning_color,
-        ),
-        Command.BIRTHDAYS: (handlers.show_birthdays, True, cli.warning_color),
-        Command.ADD_NOTE: (handlers.add_note, True, cli.success_color),
-        Command.FIND_NOTE: (handlers.find_note, True, cli.warning_color),
-        Command.SHOW_NOTES: (handlers.show_notes, False, cli.warning_color),
-        Command.EDIT_NOTE: (handlers.edit_note, True, cli.success_color),
-        Command.DELETE_NOTE: (handlers.delete_note, True, cli.success_color),
-        Command.ADD_NOTE_TAG: (handlers.add_note_tag, True, cli.success_color),
-        Command.DELETE_NOTE_TAG: (
-            handlers.delete_note_tag,
-            True,
-            cli.success_color,
-        ),
-        Command.FIND_NOTE_BY_TAG: (
-            handlers.find_note_by_tag,
-            True,
-            cli.warning_color,
-        ),
-        Command.SHOW_NOTES_ORDERED_BY_TAG_ASC: (
-            handlers.show_notes_tag_sorted,
-            False,
-            cli.warning_color,
-        ),
-        Command.SHOW_NOTES_ORDERED_BY_TAG_DESC: (
-            handlers.show_notes_tag_desc_sorted,
-            False,
-            cli.warning_color,
-        ),
-    }
-    mutating_commands = {
+# (command, handler method, whether it takes args, CLI color attribute)
+_COMMAND_SPEC = (
+    (Command.HELLO, "hello", False, "info_color"),
+    (Command.ADD, "add_contact", True, "success_color"),
+    (Command.DELETE, "delete_contact", True, "info_color"),
+    (Command.SEARCH, "search_contact", True, "info_color"),
+    (Command.ADD_EMAIL, "add_email", True, "success_color"),
+    (Command.EMAILS, "show_emails", True, "warning_color"),
+    (Command.CHANGE_EMAIL, "change_email", True, "success_color"),
+    (Command.SET_ADDRESS, "set_address", True, "success_color"),
+    (Command.CHANGE_PHONE, "change_phone", True, "success_color"),
+    (Command.PHONES, "show_phones", True, "warning_color"),
+    (Command.ALL, "show_all_stream", False, "warning_color"),
+    (Command.ADD_BIRTHDAY, "add_birthday", True, "success_color"),
+    (Command.SHOW_BIRTHDAY, "show_birthday", True, "warning_color"),
+    (Command.BIRTHDAYS, "show_birthdays", True, "warning_color"),
+    (Command.ADD_NOTE, "add_note", True, "success_color"),
+    (Command.FIND_NOTE, "find_note", True, "warning_color"),
+    (Command.SHOW_NOTES, "show_notes", False, "warning_color"),
+    (Command.EDIT_NOTE, "edit_note", True, "success_color"),
+    (Command.DELETE_NOTE, "delete_note", True, "success_color"),
+    (Command.ADD_NOTE_TAG, "add_note_tag", True, "success_color"),
+    (Command.DELETE_NOTE_TAG, "delete_note_tag", True, "success_color"),
+    (Command.FIND_NOTE_BY_TAG, "find_note_by_tag", True, "warning_color"),
+    (
+        Command.SHOW_NOTES_ORDERED_BY_TAG_ASC,
+        "show_notes_tag_sorted",
+        False,
+        "warning_color",
+    ),
+    (
+        Command.SHOW_NOTES_ORDERED_BY_TAG_DESC,
+        "show_notes_tag_desc_sorted",
+        False,
+        "warning_color",
+    ),
+)
+
+_MUTATING_COMMANDS = frozenset(
+    {
         Command.ADD,
         Command.DELETE,
         Command.ADD_EMAIL,
@@ -73,38 +64,72 @@ def init_bot():
         Command.ADD_NOTE_TAG,
         Command.DELETE_NOTE_TAG,
     }
+)
+
+_SAVE_INTERVAL_SECONDS = 2.0
+_SAVE_EVERY_MUTATIONS = 16
+
+
+def init_bot():
+    """Run the assistant bot CLI loop."""
+    cli = AssistantCLI()
+    storage = AssistantBotStorage()
+    book, notes = storage.load_data() or (AddressBook(), Notes())
+    handlers = AssistantBotHandlers(book, notes)
+
+    command_actions = {
+        command: (
+            getattr(handlers, handler_name),
+            requires_args,
+            getattr(cli, color_name),
+        )
+        for command, handler_name, requires_args, color_name in _COMMAND_SPEC
+    }
 
     cli.print_message("Welcome to the assistant bot!", cli.info_color)
+    if storage.notice:
+        cli.print_message(storage.notice, cli.warning_color)
     cli.print_main_menu()
 
-    while True:
-        user_input = cli.get_user_input()
-        if not user_input.strip():
-            continue
-        command, args = cli.parse_input(user_input)
-
-        if command is None:
-            cli.print_message("Invalid command.", cli.error_color)
-            continue
+    pending_mutations = 0
+    last_save = time.monotonic()
+    try:
+        while True:
+            user_input = cli.get_user_input()
+            if not user_input.strip():
+                continue
+            command, args = cli.parse_input(user_input)
 
-        if command in (Command.CLOSE, Command.EXIT):
-            cli.print_message("Good bye!", cli.info_color)
-            break
+            if command is None:
+                cli.print_message("Invalid command.", cli.error_color)
+                continue
 
-        if command == Command.HELLO:
-            cli.print_message("How can I help you?", cli.info_color)
-            continue
+            if command in (Command.CLOSE, Command.EXIT):
+                cli.print_message("Good bye!", cli.info_color)
+                break
 
-        action = command_actions.get(command)
-        if action is None:
-            cli.print_message("Invalid command.", cli.error_color)
-            continue
+            action = command_actions.get(command)
+            if action is None:
+                cli.print_message("Invalid command.", cli.error_color)
+                continue
 
-        handler, requires_args, color = action
-        result = handler(args) if requires_args else handler()
-        cli.print_message(result, color)
+            handler, requires_args, color = action
+            # Counted up front so an interrupted edit is still saved.
+            if command in _MUTATING_COMMANDS:
+                pending_mutations += 1
+            result = handler(args) if requires_args else handler()
+            cli.print_message(result, color)
 
-        if command in mutating_commands:
+            # Batch saves: a burst of edits is written once, not per command.
+            if pending_mutations and (
+                pending_mutations >= _SAVE_EVERY_MUTATIONS
+                or time.monotonic() - last_save >= _SAVE_INTERVAL_SECONDS
+            ):
+                storage.save_data((book, notes))
+                pending_mutations = 0
+                last_save = time.monotonic()
+    finally:
+        # Without edits the file on disk is already current, and a failed
+        # legacy import must not be replaced by an empty data file.
+        if pending_mutations:
             storage.save_data((book, notes))
-
-    storage.save_data((book, notes))
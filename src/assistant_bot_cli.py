@@ -1,8 +1,11 @@
 """CLI helpers, command definitions, and styling for the assistant bot."""
 
+import sys
+from bisect import bisect_left
 from enum import Enum
+from itertools import islice
 from textwrap import dedent
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple, Union
 
 from colorama import Fore, Style as ColoramaStyle, init as colorama_init
 from prompt_toolkit import prompt
@@ -47,7 +50,8 @@ class FirstWordCompleter(Completer):
     """Completer that suggests commands only for the first word."""
 
     def __init__(self, commands: List[str]) -> None:
-        self.commands = commands
+        # Sorted so matching commands form one contiguous bisect range.
+        self.commands = sorted(command.lower() for command in commands)
 
     def get_completions(self, document, complete_event):
         text_before_cursor = document.current_line
@@ -63,13 +67,13 @@ class FirstWordCompleter(Completer):
             word_before_cursor = ""
 
         word_lower = word_before_cursor.lower()
+        start_position = -len(word_before_cursor)
 
-        for command in self.commands:
-            if command.startswith(word_lower):
-                yield Completion(
-                    command,
-                    start_position=-len(word_before_cursor),
-                )
+        index = bisect_left(self.commands, word_lower)
+        for command in islice(self.commands, index, None):
+            if not command.startswith(word_lower):
+                break
+            yield Completion(command, start_position=start_position)
 
 
 class AssistantCLI:
@@ -118,10 +122,24 @@ class AssistantCLI:
             """
         ).strip()
 
-    def print_message(self, message: str, color: Optional[str] = None) -> None:
-        """Print a message to stdout with color highlighting."""
+    def print_message(
+        self, message: Union[str, Iterable[str]], color: Optional[str] = None
+    ) -> None:
+        """Print a message to stdout with color highlighting.
+
+        Non-string messages are treated as an iterable of lines and written
+        one at a time, so large tables are never joined into one string.
+        """
         applied_color = color or self.default_color
-        print(f"\n{applied_color}{message}{ColoramaStyle.RESET_ALL}\n")
+        if isinstance(message, str):
+            print(f"\n{applied_color}{message}{ColoramaStyle.RESET_ALL}\n")
+            return
+        write = sys.stdout.write
+        for line in message:
+            # Colour is repeated per line because autoreset resets it after
+            # every write.
+            write(f"\n{applied_color}{line}")
+        write(f"{ColoramaStyle.RESET_ALL}\n\n")
 
     def print_main_menu(self) -> None:
         """Display the available commands."""
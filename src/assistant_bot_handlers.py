@@ -1,14 +1,169 @@
 """Command handler class for the assistant bot."""
 
-from typing import List
+from datetime import date
+from math import isfinite
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
 
-from tabulate import tabulate
+from wcwidth import wcswidth
 
 from src.notes import Notes
 from src.address_book import AddressBook, Record
 from src.input_error import input_error
 
 
+_CONTACT_HEADERS = ("Name", "Birthday", "Phones", "Emails", "Address")
+_NOTE_HEADERS = ("№", "Tags", "Note")
+_EMAIL_HEADERS = ("Name", "Email")
+_PHONE_HEADERS = ("Name", "Phone")
+_BIRTHDAY_HEADERS = ("Name", "Congratulation date")
+
+
+def _tabulate(rows, headers: Sequence[str]) -> str:
+    """Render rows with tabulate, importing it lazily on first use."""
+    from tabulate import tabulate
+
+    return tabulate(rows, headers=headers, tablefmt="plain")
+
+
+def _cell_width(cell: str) -> int:
+    """Return the terminal width of a cell, accounting for wide glyphs."""
+    width = wcswidth(cell)
+    return width if width >= 0 else len(cell)
+
+
+# Column types in tabulate's order of generality; a column takes the most
+# general type among its cells.
+_BOOL_CELL, _INT_CELL, _FLOAT_CELL, _TEXT_CELL = range(4)
+
+
+def _cell_type(cell: str) -> int:
+    """Classify a cell the way tabulate's number parsing does."""
+    if cell.isdecimal():
+        return _INT_CELL
+    if cell in ("True", "False"):
+        return _BOOL_CELL
+    try:
+        int(cell)
+    except ValueError:
+        pass
+    else:
+        return _INT_CELL
+    try:
+        number = float(cell)
+    except ValueError:
+        return _TEXT_CELL
+    # tabulate only accepts these spellings of infinities and NaN.
+    if not isfinite(number) and cell.lower() not in ("inf", "-inf", "nan"):
+        return _TEXT_CELL
+    return _FLOAT_CELL
+
+
+def _contact_row(contact: Record, join=", ".join) -> List[str]:
+    """Render the table cells for one contact."""
+    phones, emails = contact.phones, contact.emails
+    return [
+        contact.name.value,
+        str(contact.birthday) if contact.birthday else "-",
+        join(phones) if phones else "-",
+        join(email.value for email in emails.values()) if emails else "-",
+        contact.address or "-",
+    ]
+
+
+class _PlainTable:
+    """Accumulate rows and render them like tabulate's "plain" format.
+
+    Column widths and types are tracked while rows are added, so the
+    final render is a single formatting pass. Cells are stripped, columns
+    are separated by two spaces, headers get two extra characters of room,
+    integer columns are right-aligned and trailing spaces are trimmed.
+    Tables with a float column are handed to tabulate, which reformats
+    and decimal-aligns those numbers.
+    """
+
+    def __init__(self, headers: Sequence[str]) -> None:
+        self.headers = headers
+        self.rows: List[List[str]] = []
+        self.widths = [_cell_width(header) + 2 for header in headers]
+        self.column_types = [_BOOL_CELL] * len(headers)
+
+    def add_row(self, row: List[str]) -> None:
+        """Append a row and widen/realign its columns as needed."""
+        self.measure(row)
+        self.rows.append(row)
+
+    def measure(self, row: Sequence[str]) -> None:
+        """Widen/realign the columns for a row without storing it."""
+        widths = self.widths
+        column_types = self.column_types
+        for index, cell in enumerate(row):
+            cell = cell.strip()
+            width = _cell_width(cell)
+            if width > widths[index]:
+                widths[index] = width
+            if column_types[index] != _TEXT_CELL:
+                cell_type = _cell_type(cell)
+                if cell_type > column_types[index]:
+                    column_types[index] = cell_type
+
+    @property
+    def has_floats(self) -> bool:
+        """Check whether a column needs tabulate's float formatting."""
+        return _FLOAT_CELL in self.column_types
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __format_row(self, cells: Sequence[str], strip: bool = True) -> str:
+        """Pad every cell to its column width and join them."""
+        padded = []
+        for cell, width, column_type in zip(
+            cells, self.widths, self.column_types
+        ):
+            if strip:
+                cell = cell.strip()
+            padding = " " * (width - _cell_width(cell))
+            if column_type == _INT_CELL:
+                padded.append(padding + cell)
+            else:
+                padded.append(cell + padding)
+        return "  ".join(padded).rstrip()
+
+    def __iter__(self) -> Iterator[str]:
+        """Yield the rendered header line followed by each row line."""
+        if self.has_floats:
+            yield from _tabulate(self.rows, self.headers).split("\n")
+            return
+        yield self.__format_row(self.headers, strip=False)
+        for row in self.rows:
+            yield self.__format_row(row)
+
+    def __str__(self) -> str:
+        """Render the header line followed by all rows."""
+        return "\n".join(self)
+
+    @classmethod
+    def stream(
+        cls,
+        headers: Sequence[str],
+        make_rows: Callable[[], Iterable[Sequence[str]]],
+    ) -> Iterator[str]:
+        """Render rows without buffering them by generating them twice.
+
+        The first pass only measures the columns; the second formats each
+        row as it is produced, so memory stays bounded by a single row.
+        """
+        table = cls(headers)
+        for row in make_rows():
+            table.measure(row)
+        if table.has_floats:
+            yield from _tabulate(list(make_rows()), headers).split("\n")
+            return
+        yield table.__format_row(headers, strip=False)
+        for row in make_rows():
+            yield table.__format_row(row)
+
+
 class AssistantBotHandlers:
     """Encapsulates the contact management operations."""
 
@@ -17,6 +172,15 @@ class AssistantBotHandlers:
         self.book = book
         self.notes = notes
 
+    def hello(self):
+        """Greet the user."""
+        return "How can I help you?"
+
+    def __get_note_index(self, index: str) -> Optional[int]:
+        """Convert a displayed note number to a list index if it exists."""
+        real_index = int(index) - 1
+        return real_index if 0 <= real_index < len(self.notes) else None
+
     @input_error
     def add_note(self, args):
         """Create a new note composed from all provided arguments."""
@@ -26,27 +190,22 @@ class AssistantBotHandlers:
         self.notes.add(note)
         return "Note added."
 
-    @input_error
     def show_notes(self):
         """Return the full notes list formatted as a readable table."""
         if self.notes:
             rows = self.notes.show()
-            return tabulate(
-                rows,
-                headers=["№", "Tags", "Note"],
-                tablefmt="plain",
-            )
+            return _tabulate(rows, _NOTE_HEADERS)
         return "Notes are empty."
 
     @input_error
     def edit_note(self, args):
         """Replace a note by its index with the provided text."""
         index, *new_note = args
+        real_index = self.__get_note_index(index)
         note = " ".join(new_note)
-        real_index = int(index) - 1
         if not note:
             return "Note text is empty."
-        if not 0 <= real_index < len(self.notes):
+        if real_index is None:
             return "No note found for this number."
         self.notes.edit(real_index, note)
         return "Note updated."
@@ -54,14 +213,12 @@ class AssistantBotHandlers:
     @input_error
     def delete_note(self, args):
         """Remove a note by its displayed index."""
-        index = int(args[0]) - 1
-        if 0 <= index < len(self.notes):
-            self.notes.delete(index)
-        else:
+        index = self.__get_note_index(args[0])
+        if index is None:
             return "No note found for this number."
+        self.notes.delete(index)
         return "Note deleted."
 
-    @input_error
     def find_note(self, args):
         """Find notes that contain the given text (case-insensitive search)."""
         query = " ".join(args)
@@ -70,21 +227,17 @@ class AssistantBotHandlers:
         matches = self.notes.find(query)
         if not matches:
             return f"No notes found for '{query}'."
-        return tabulate(
-            matches,
-            headers=["№", "Tags", "Note"],
-            tablefmt="plain",
-        )
+        return _tabulate(matches, _NOTE_HEADERS)
 
     @input_error
     def add_note_tag(self, args):
         """Append a tag to the note addressed by its displayed index."""
         index, *new_tag = args
+        real_index = self.__get_note_index(index)
         tag = " ".join(new_tag)
-        real_index = int(index) - 1
         if not tag:
             return "Tag text is empty."
-        if not 0 <= real_index < len(self.notes):
+        if real_index is None:
             return "No note found for this number."
         self.notes.add_tag(real_index, tag)
         return "Note updated."
@@ -93,16 +246,15 @@ class AssistantBotHandlers:
     def delete_note_tag(self, args):
         """Remove the provided tag from the selected note."""
         index, *tag_list = args
+        real_index = self.__get_note_index(index)
         tag = " ".join(tag_list)
-        real_index = int(index) - 1
         if not tag:
             return "Tag text is empty."
-        if not 0 <= real_index < len(self.notes):
+        if real_index is None:
             return "No note found for this number."
         self.notes.delete_tag(real_index, tag)
         return "Tag deleted."
 
-    @input_error
     def find_note_by_tag(self, args):
         """Find and list notes whose tag set contains the provided tag."""
         tag = " ".join(args)
@@ -111,25 +263,15 @@ class AssistantBotHandlers:
         matches = self.notes.find_by_tag(tag)
         if not matches:
             return f"No notes found for tag '{tag}'."
-        return tabulate(
-            matches,
-            headers=["№", "Tags", "Note"],
-            tablefmt="plain",
-        )
+        return _tabulate(matches, _NOTE_HEADERS)
 
-    @input_error
     def show_notes_tag_sorted(self, reverse: bool = False):
         """Display all notes sorted by their tag string, asc by default."""
         if self.notes:
             rows = self.notes.sort_by_tag(reverse)
-            return tabulate(
-                rows,
-                headers=["№", "Tags", "Note"],
-                tablefmt="plain",
-            )
+            return _tabulate(rows, _NOTE_HEADERS)
         return "Notes are empty."
 
-    @input_error
     def show_notes_tag_desc_sorted(self):
         """Display all notes sorted by tag string in descending order."""
         return self.show_notes_tag_sorted(reverse=True)
@@ -148,10 +290,11 @@ class AssistantBotHandlers:
             contact.add_phone(phone)
         return message
 
-    @input_error
     def delete_contact(self, args):
         """Delete a contact entry from the address book."""
-        name, *_ = args
+        if not args:
+            return "Contact name is empty."
+        name = args[0]
         contact = self.book.delete(name)
         if contact is None:
             return f'Contact "{name}" does not exist.'
@@ -170,9 +313,10 @@ class AssistantBotHandlers:
         else:
             return "Email is empty."
 
-    @input_error
     def show_emails(self, args):
         """Display all emails saved for the selected contact."""
+        if not args:
+            return "Contact name is empty."
         name = args[0]
         contact = self.book.find(name)
         if contact is None:
@@ -181,13 +325,9 @@ class AssistantBotHandlers:
             return f'The contact "{name}" has no emails.'
         rows = [
             [contact.name.value, str(email)]
-            for email in contact.emails
+            for email in contact.emails.values()
         ]
-        return tabulate(
-            rows,
-            headers=["Name", "Email"],
-            tablefmt="plain",
-        )
+        return _tabulate(rows, _EMAIL_HEADERS)
 
     @input_error
     def change_email(self, args):
@@ -201,9 +341,10 @@ class AssistantBotHandlers:
         contact.edit_email(old_email, new_email)
         return "Contact updated."
 
-    @input_error
     def set_address(self, args):
         """Set or update the free-form address for a contact."""
+        if not args:
+            return "Contact name is empty."
         name, *address_list = args
         address = " ".join(address_list)
         contact = self.book.find(name)
@@ -227,9 +368,10 @@ class AssistantBotHandlers:
         contact.edit_phone(old_phone, new_phone)
         return "Contact updated."
 
-    @input_error
     def show_phones(self, args):
         """Display the phone numbers for a specified contact."""
+        if not args:
+            return "Contact name is empty."
         name = args[0]
         contact = self.book.find(name)
         if contact is None:
@@ -238,64 +380,42 @@ class AssistantBotHandlers:
             return f'The contact "{name}" has no phones.'
         rows = [
             [contact.name.value, str(phone)]
-            for phone in contact.phones
+            for phone in contact.phones.values()
         ]
-        return tabulate(
-            rows,
-            headers=["Name", "Phone"],
-            tablefmt="plain",
-        )
+        return _tabulate(rows, _PHONE_HEADERS)
 
-    def __get_contacts(self, contacts: List[Record]):
-        """Convert contact objects to table rows with all key fields."""
-        rows = []
+    def __get_contacts(self, contacts: Iterable[Record]) -> _PlainTable:
+        """Collect contact objects into a table with all key fields."""
+        table = _PlainTable(_CONTACT_HEADERS)
+        add_row = table.add_row
         for contact in contacts:
-            phones = "-"
-            if contact.phones:
-                phones = ", ".join(str(phone) for phone in contact.phones)
-
-            emails = "-"
-            if contact.emails:
-                emails = ", ".join(str(email) for email in contact.emails)
-
-            birthday = str(contact.birthday) if contact.birthday else "-"
-
-            rows.append(
-                [
-                    contact.name.value,
-                    birthday,
-                    phones,
-                    emails,
-                    contact.address or "-",
-                ]
-            )
-        return rows
+            add_row(_contact_row(contact))
+        return table
 
-    @input_error
     def search_contact(self, args):
         """Search contacts that match names, phones, or emails."""
         query = " ".join(args)
         if not query:
             return "Search query is empty."
-        rows = self.__get_contacts(self.book.search(query))
-        if not rows:
+        table = self.__get_contacts(self.book.search(query))
+        if not table:
             return f"No contacts found for '{query}'."
-        return tabulate(
-            rows,
-            headers=["Name", "Birthday", "Phones", "Emails", "Address"],
-            tablefmt="plain",
-        )
+        return str(table)
 
-    @input_error
     def show_all(self):
         """Format and return a list of all contacts and their phone numbers."""
-        rows = self.__get_contacts(self.book.data.values())
-        if not rows:
+        table = self.__get_contacts(self.book.values())
+        if not table:
             return "Address book is empty."
-        return tabulate(
-            rows,
-            headers=["Name", "Birthday", "Phones", "Emails", "Address"],
-            tablefmt="plain",
+        return str(table)
+
+    def show_all_stream(self) -> Iterator[str]:
+        """Yield the all-contacts table line by line for large books."""
+        if not self.book:
+            yield "Address book is empty."
+            return
+        yield from _PlainTable.stream(
+            _CONTACT_HEADERS, lambda: map(_contact_row, self.book.values())
         )
 
     @input_error
@@ -308,7 +428,6 @@ class AssistantBotHandlers:
         contact.add_birthday(birthday)
         return "Contact birthday added."
 
-    @input_error
     def show_birthday(self, args):
         """Display the birthday for a specified contact."""
         if not args:
@@ -321,26 +440,26 @@ class AssistantBotHandlers:
             return "Contact date of birth is not specified."
         return str(contact.birthday)
 
-    @input_error
     def show_birthdays(self, args):
         """Show birthdays that will occur within the next count_days."""
         if not args:
             return "Days count is required."
-        count_days = args[0]
-        if not count_days.isdigit():
+        try:
+            days = int(args[0])
+        except ValueError:
             return "Days count must be a positive number."
-        days = int(count_days)
         if days <= 0:
             return "Days count must be greater than zero."
 
         rows = [
-            [congratulation.name, congratulation.congratulation_date]
-            for congratulation in self.book.get_upcoming_birthdays(days)
+            [
+                congratulation.name,
+                f"{congratulation.congratulation_date:%d.%m.%Y}",
+            ]
+            for congratulation in self.book.get_upcoming_birthdays(
+                days, date.today()
+            )
         ]
         if not rows:
             return "No upcoming birthdays."
-        return tabulate(
-            rows,
-            headers=["Name", "Congratulation date"],
-            tablefmt="plain",
-        )
+        return _tabulate(rows, _BIRTHDAY_HEADERS)
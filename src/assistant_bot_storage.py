@@ -1,7 +1,102 @@
 """Persistence helpers for the assistant bot."""
 
+import json
+import os
 import pickle
+from datetime import date
 from pathlib import Path
+from typing import Callable, List, Tuple
+
+from src.address_book import AddressBook, Record
+from src.notes import Note, Notes
+
+_BUFFER_SIZE = 1 << 20
+_LEGACY_FILE_NAME = "assistant_bot.pkl"
+# Classes the pickle-based storage used to write.
+_LEGACY_CLASSES = {
+    ("src.address_book", name)
+    for name in ("AddressBook", "Record", "Name", "Phone", "Email", "Birthday")
+} | {("src.notes", name) for name in ("Notes", "Note", "Tags")}
+
+
+class _LegacyObject:
+    """Inert stand-in for any class found in a legacy pickle file."""
+
+
+class _LegacyUnpickler(pickle.Unpickler):
+    """Unpickler that only rebuilds the old bot classes as inert shims."""
+
+    def find_class(self, module, name):
+        if (module, name) == ("datetime", "date"):
+            return date
+        if (module, name) in _LEGACY_CLASSES:
+            return _LegacyObject
+        raise pickle.UnpicklingError(f"Unexpected class {module}.{name}")
+
+
+def _legacy_to_data(legacy) -> Tuple[Tuple[AddressBook, Notes], List[str]]:
+    """Rebuild (book, notes) from legacy shims, skipping invalid values.
+
+    Every value goes through the current validation one at a time, so a
+    value the old code accepted but the new rules reject (for example a
+    phone written with non-ASCII digits) is reported instead of failing
+    the whole import.
+    """
+    book, notes = legacy
+    skipped: List[str] = []
+    records = []
+    for name, legacy_record in book.data.items():
+        if not isinstance(name, str):
+            skipped.append(f"contact {name!r}")
+            continue
+        contact_record = Record(name)
+        for phone in getattr(legacy_record, "phones", ()):
+            value = getattr(phone, "_value", None)
+            if not _try_import(contact_record.add_phone, value):
+                skipped.append(f"{name}: phone {value!r}")
+        for email in getattr(legacy_record, "emails", ()):
+            value = getattr(email, "_value", None)
+            if not _try_import(contact_record.add_email, value):
+                skipped.append(f"{name}: email {value!r}")
+        birthday = getattr(legacy_record, "birthday", None)
+        value = getattr(birthday, "_value", None)
+        if isinstance(value, date):
+            value = f"{value:%d.%m.%Y}"
+        if value is not None and not _try_import(
+            contact_record.add_birthday, value
+        ):
+            skipped.append(f"{name}: birthday {value!r}")
+        value = getattr(legacy_record, "address", None)
+        if value is None or isinstance(value, str):
+            contact_record.address = value
+        else:
+            skipped.append(f"{name}: address {value!r}")
+        records.append((name, contact_record))
+
+    imported_notes = []
+    for number, legacy_note in enumerate(notes.data, start=1):
+        value = getattr(legacy_note, "_Note__value", None)
+        try:
+            note = Note(value)
+        except (AttributeError, ValueError):
+            skipped.append(f"note {number}")
+            continue
+        for tag in getattr(getattr(legacy_note, "tags", None), "data", ()):
+            if isinstance(tag, str) and tag.strip():
+                note.tags.add(tag)
+            else:
+                skipped.append(f"note {number}: tag {tag!r}")
+        imported_notes.append(note)
+    return (AddressBook(records), Notes(imported_notes)), skipped
+
+
+def _try_import(add_value: Callable[[str], None], value) -> bool:
+    """Add one legacy value; return False if validation rejects it."""
+    try:
+        add_value(value)
+    except ValueError:
+        return False
+    return True
 
 
 class AssistantBotStorage:
@@ -10,25 +105,92 @@ class AssistantBotStorage:
     def __init__(self, data_dir: Path | None = None) -> None:
         base_dir = Path(__file__).resolve().parent.parent
         self.data_dir = data_dir or (base_dir / "data")
-        self.address_book_file = self.data_dir / "assistant_bot.pkl"
+        self.address_book_file = self.data_dir / "assistant_bot.json"
+        self.legacy_file = self.data_dir / _LEGACY_FILE_NAME
+        # Message about a legacy data migration for the CLI to show.
+        self.notice: str | None = None
 
     def ensure_data_dir(self) -> None:
         """Ensure that the storage directory for the data exists."""
         self.data_dir.mkdir(parents=True, exist_ok=True)
 
     def save_data(self, data, filename: Path | None = None):
-        """Persist the data to disk."""
+        """Persist the data to disk as JSON, replacing the file atomically."""
         self.ensure_data_dir()
+        book, notes = data
+        payload = {"contacts": book.to_dict(), "notes": notes.to_list()}
         target_file = filename or self.address_book_file
-        with target_file.open("wb") as file_handle:
-            pickle.dump(data, file_handle)
+        temp_file = target_file.with_name(f"{target_file.name}.tmp")
+        with temp_file.open(
+            "w", encoding="utf-8", buffering=_BUFFER_SIZE
+        ) as file_handle:
+            json.dump(
+                payload,
+                file_handle,
+                ensure_ascii=False,
+                separators=(",", ":"),
+            )
+        os.replace(temp_file, target_file)
 
     def load_data(self, filename: Path | None = None):
         """Load the data from disk or return a None if no file exists."""
         self.ensure_data_dir()
         target_file = filename or self.address_book_file
         try:
-            with target_file.open("rb") as file_handle:
-                return pickle.load(file_handle)
+            with target_file.open(
+                "r", encoding="utf-8", buffering=_BUFFER_SIZE
+            ) as file_handle:
+                payload = json.load(file_handle)
         except FileNotFoundError:
+            if filename is None and self.legacy_file.exists():
+                return self.migrate_legacy_data()
             return None
+        return self.__from_payload(payload)
+
+    def migrate_legacy_data(self):
+        """Convert the old pickle file to JSON once; None if it fails.
+
+        Values that no longer pass validation are skipped and listed in
+        the notice. Nothing is written if the file cannot be read at all.
+        """
+        try:
+            with self.legacy_file.open("rb") as file_handle:
+                legacy = _LegacyUnpickler(file_handle).load()
+            data, skipped = _legacy_to_data(legacy)
+        except (
+            pickle.UnpicklingError,
+            EOFError,
+            AttributeError,
+            TypeError,
+            ValueError,
+            KeyError,
+        ) as err:
+            self.notice = (
+                f"Could not import {self.legacy_file.name} ({err}); "
+                "starting with empty data. The old file was left untouched."
+            )
+            return None
+        self.save_data(data)
+        self.notice = (
+            f"Imported contacts and notes from {self.legacy_file.name} "
+            f"into {self.address_book_file.name}. "
+        )
+        if skipped:
+            self.notice += (
+                f"Skipped {len(skipped)} value(s) that are no longer valid; "
+                f"{self.legacy_file.name} still holds them:\n  "
+                + "\n  ".join(skipped)
+            )
+        else:
+            self.notice += (
+                "The old file is no longer used and can be deleted."
+            )
+        return data
+
+    @staticmethod
+    def __from_payload(payload: dict):
+        """Build the (book, notes) pair from the JSON layout."""
+        return (
+            AddressBook.from_dict(payload.get("contacts", {})),
+            Notes.from_list(payload.get("notes", [])),
+        )
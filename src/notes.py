@@ -1,36 +1,106 @@
 """Utility classes for managing notes with text content and searchable tags."""
 
-from collections import UserList
+import sys
+from bisect import bisect_right
+from collections import OrderedDict, UserList
+from itertools import accumulate
+from operator import attrgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 
-class Tags(UserList[str]):
+_FIND_CACHE_SIZE = 128
+
+# (displayed number, rendered tags, note text)
+NoteRow = Tuple[int, str, str]
+
+_get_tags = attrgetter("tags")
+_get_value = attrgetter("value")
+
+# Bumped by every change to a note's text or tags, wherever it comes from,
+# so a Notes collection can tell that its lookup structures are stale.
+_edit_count = 0
+
+
+def _record_edit() -> None:
+    """Advance the edit counter after a note's text or tags changed."""
+    global _edit_count
+    _edit_count += 1
+
+
+class Tags:
     """Normalized collection of unique tags for a note."""
 
+    __slots__ = ("data", "_sorted", "_str")
+
+    def __init__(self, tags: Iterable[str] = ()):
+        self.data: Set[str] = {sys.intern(tag.lower()) for tag in tags}
+        self._sorted: Optional[Tuple[str, ...]] = None
+        self._str: Optional[str] = None
+
     def add(self, tag: str):
         """Add tag if it is not already present (case-insensitive)."""
-        if tag.lower() in self.data:
-            return
-        self.data.append(tag.lower())
+        self.add_normalized(sys.intern(tag.lower()))
+
+    def add_normalized(self, tag: str):
+        """Add a tag that is already lowercased."""
+        self.data.add(tag)
+        self._sorted = None
+        self._str = None
+        _record_edit()
 
     def delete(self, tag: str):
         """Remove tag if it exists."""
-        for index, value in enumerate(self.data):
-            if tag.lower() == value:
-                self.data.pop(index)
-                break
+        self.delete_normalized(tag.lower())
+
+    def delete_normalized(self, tag: str):
+        """Remove a tag that is already lowercased."""
+        self.data.discard(tag)
+        self._sorted = None
+        self._str = None
+        _record_edit()
+
+    def as_sorted(self) -> Tuple[str, ...]:
+        """Return a cached, alphabetically sorted snapshot of the tags."""
+        if self._sorted is None:
+            self._sorted = tuple(sorted(self.data))
+        return self._sorted
+
+    def __contains__(self, tag: object) -> bool:
+        return tag in self.data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
 
     def __str__(self):
         """Return comma-separated string of sorted tags."""
-        return ", ".join(sorted(self.data))
+        if self._str is None:
+            self._str = ", ".join(self.as_sorted())
+        return self._str
 
 
 class Note:
     """Message-like entity that stores note text and its tags."""
 
+    __slots__ = ("__value", "__value_folded", "__tags")
+
     def __init__(self, value: str):
-        self.__value = None
-        self.value = value
-        self.tags = Tags()
+        # A new note belongs to no collection yet, so it is not an edit.
+        self.__set_value(value)
+        self.__tags = Tags()
+
+    def to_dict(self) -> dict:
+        """Convert the note to JSON-friendly primitives."""
+        return {"value": self.value, "tags": list(self.tags.as_sorted())}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Note":
+        """Rebuild a note from `to_dict` output."""
+        note = cls(data["value"])
+        note.__tags = Tags(data.get("tags", []))
+        return note
 
     @property
     def value(self):
@@ -40,68 +110,315 @@ class Note:
     @value.setter
     def value(self, value: str):
         """Set note text ensuring it is not empty."""
+        self.__set_value(value)
+        _record_edit()
+
+    def __set_value(self, value: str) -> None:
+        """Validate and store note text with its case-folded copy."""
         if not value.strip():
             raise ValueError("Note text is empty")
         self.__value = value
+        self.__value_folded = value.casefold()
+
+    @property
+    def value_folded(self):
+        """Return the case-folded note text cached for searching."""
+        return self.__value_folded
+
+    @property
+    def tags(self) -> Tags:
+        """Return the note's tag collection."""
+        return self.__tags
+
+    @tags.setter
+    def tags(self, tags: Tags):
+        """Replace the note's tag collection."""
+        self.__tags = tags
+        _record_edit()
 
 
 class Notes(UserList[Note]):
     """Collection of notes supporting CRUD operations and tag lookups."""
 
+    def __init__(self, initlist: Optional[Iterable[Note]] = None):
+        super().__init__(initlist)
+        self._corpus: Optional[str] = None
+        self._offsets: List[int] = []
+        self._find_cache: "OrderedDict[Tuple[str, str], List[NoteRow]]" = (
+            OrderedDict()
+        )
+        self._by_tag: Dict[str, Set[int]] = {}
+        # Value of _edit_count that the lookup structures reflect.
+        self._version = _edit_count
+        self.__reindex()
+
+    def __reindex(self) -> None:
+        """Rebuild every derived lookup structure from the stored notes."""
+        self._corpus = None
+        self._find_cache.clear()
+        self._by_tag = {}
+        for idx, note in enumerate(self.data):
+            for tag in note.tags:
+                self._by_tag.setdefault(tag, set()).add(idx)
+        self._version = _edit_count
+
+    def __sync(self) -> None:
+        """Reindex if a note was edited directly since the last update."""
+        if self._version != _edit_count:
+            self.__reindex()
+
+    def append(self, item: Note):
+        """Append a note, extending the tag index and text corpus."""
+        self.__sync()
+        index = len(self.data)
+        self.data.append(item)
+        for tag in item.tags:
+            self._by_tag.setdefault(tag, set()).add(index)
+        self.__append_to_corpus(item)
+        self._find_cache.clear()
+
+    def pop(self, i: int = -1) -> Note:
+        """Remove and return the note at position i."""
+        note = self.data[i]
+        self.delete(i)
+        return note
+
+    def remove(self, item: Note):
+        """Remove the first occurrence of a note."""
+        self.delete(self.data.index(item))
+
+    def __delitem__(self, i):
+        if isinstance(i, slice):
+            super().__delitem__(i)
+            self.__reindex()
+        else:
+            self.delete(i)
+
+    def __setitem__(self, i, item):
+        super().__setitem__(i, item)
+        self.__reindex()
+
+    def insert(self, i: int, item: Note):
+        """Insert a note before position i."""
+        super().insert(i, item)
+        self.__reindex()
+
+    def extend(self, other: Iterable[Note]):
+        """Append several notes."""
+        super().extend(other)
+        self.__reindex()
+
+    def __iadd__(self, other):
+        super().__iadd__(other)
+        self.__reindex()
+        return self
+
+    def __imul__(self, n: int):
+        super().__imul__(n)
+        self.__reindex()
+        return self
+
+    def clear(self):
+        """Remove every note."""
+        super().clear()
+        self.__reindex()
+
+    def reverse(self):
+        """Reverse the note order in place."""
+        super().reverse()
+        self.__reindex()
+
+    def sort(self, /, *args, **kwds):
+        """Sort the notes in place."""
+        super().sort(*args, **kwds)
+        self.__reindex()
+
+    def to_list(self) -> list:
+        """Convert all notes to a JSON-friendly list."""
+        return [note.to_dict() for note in self.data]
+
+    @classmethod
+    def from_list(cls, data: list) -> "Notes":
+        """Rebuild the notes collection from `to_list` output."""
+        return cls(Note.from_dict(note_data) for note_data in data)
+
     def add(self, note: str):
         """Create a Note from provided text and append it to the list."""
-        self.data.append(Note(note))
+        self.append(Note(note))
 
     def show(self):
         """Return all stored notes."""
-        return [
-            [idx + 1, str(note.tags), note.value]
-            for idx, note in enumerate(self.data)
-        ]
+        data = self.data
+        return list(
+            zip(
+                range(1, len(data) + 1),
+                map(str, map(_get_tags, data)),
+                map(_get_value, data),
+            )
+        )
 
     def edit(self, index: int, new_note: str):
         """Replace text of the note located at the provided index."""
+        self.__sync()
         self.data[index].value = new_note
+        self._corpus = None
+        self._find_cache.clear()
+        self._version = _edit_count
 
     def delete(self, index: int):
-        """Remove a note by index."""
+        """Remove a note by index and shift tag postings after it."""
+        self.__sync()
+        index = range(len(self.data))[index]
         self.data.pop(index)
+        self._corpus = None
+        self._find_cache.clear()
+        by_tag: Dict[str, Set[int]] = {}
+        for tag, positions in self._by_tag.items():
+            shifted = {
+                idx - (idx > index) for idx in positions if idx != index
+            }
+            if shifted:
+                by_tag[tag] = shifted
+        self._by_tag = by_tag
+
+    def __append_to_corpus(self, note: Note) -> None:
+        """Extend a built corpus with a note appended at the end."""
+        if self._corpus is None:
+            return
+        if self._offsets:
+            self._offsets.append(len(self._corpus) + 1)
+            self._corpus += "\0" + note.value_folded
+        else:
+            self._offsets.append(0)
+            self._corpus = note.value_folded
+
+    def __get_corpus(self) -> Tuple[str, List[int]]:
+        """Return all folded note texts joined by NUL and their offsets."""
+        if self._corpus is None:
+            folded = [note.value_folded for note in self.data]
+            self._corpus = "\0".join(folded)
+            # Running start positions; the final total is not a note start.
+            self._offsets = list(
+                accumulate((len(text) + 1 for text in folded), initial=0)
+            )[:-1]
+        return self._corpus, self._offsets
+
+    def __get_cached(self, key: Tuple[str, str]) -> Optional[List[NoteRow]]:
+        """Return a copy of a cached lookup result, refreshing its recency."""
+        cached = self._find_cache.get(key)
+        if cached is None:
+            return None
+        self._find_cache.move_to_end(key)
+        return list(cached)
+
+    def __set_cached(
+        self, key: Tuple[str, str], matches: List[NoteRow]
+    ) -> List[NoteRow]:
+        """Remember a lookup result, evicting the oldest one when full."""
+        self._find_cache[key] = list(matches)
+        if len(self._find_cache) > _FIND_CACHE_SIZE:
+            self._find_cache.popitem(last=False)
+        return matches
+
+    def iter_find(self, query: str) -> Iterator[NoteRow]:
+        """Yield notes containing the query substring (case-insensitive)."""
+        if not query:
+            return
+        self.__sync()
+        query_folded = query.casefold()
+        data = self.data
+        if "\0" in query_folded:
+            for idx, note in enumerate(data):
+                if query_folded in note.value_folded:
+                    yield (idx + 1, str(note.tags), note.value)
+            return
+
+        # One C-level scan over the joined texts; after each hit, resume
+        # at the start of the next note so every note is reported once.
+        corpus, offsets = self.__get_corpus()
+        last = len(offsets) - 1
+        position = corpus.find(query_folded)
+        while position != -1:
+            idx = bisect_right(offsets, position) - 1
+            note = data[idx]
+            yield (idx + 1, str(note.tags), note.value)
+            if idx == last:
+                return
+            position = corpus.find(query_folded, offsets[idx + 1])
 
     def find(self, query: str):
         """Return notes containing the query substring (case-insensitive)."""
         if not query:
             return []
-        return [
-            [idx + 1, str(note.tags), note.value]
-            for idx, note in enumerate(self.data)
-            if query.lower() in note.value.lower()
-        ]
+        self.__sync()
+        key = ("text", query.casefold())
+        cached = self.__get_cached(key)
+        if cached is not None:
+            return cached
+        return self.__set_cached(key, list(self.iter_find(query)))
 
     def add_tag(self, index: int, tag: str):
-        """Attach a tag to the note at the given index."""
-        self.data[index].tags.add(tag)
+        """Attach a tag to the note at the given index.
+
+        Blank tags and tags the note already has are ignored, so cached
+        lookups survive repeated additions.
+        """
+        if not tag.strip():
+            return
+        self.__sync()
+        index = range(len(self.data))[index]
+        tag_lower = sys.intern(tag.lower())
+        tags = self.data[index].tags
+        if tag_lower in tags:
+            return
+        tags.add_normalized(tag_lower)
+        self._find_cache.clear()
+        self._by_tag.setdefault(tag_lower, set()).add(index)
+        self._version = _edit_count
 
     def delete_tag(self, index: int, tag: str):
         """Remove a tag from the note at the given index."""
-        self.data[index].tags.delete(tag)
+        self.__sync()
+        index = range(len(self.data))[index]
+        tag_lower = tag.lower()
+        tags = self.data[index].tags
+        if tag_lower not in tags:
+            return
+        tags.delete_normalized(tag_lower)
+        self._find_cache.clear()
+        positions = self._by_tag.get(tag_lower)
+        if positions is not None:
+            positions.discard(index)
+            if not positions:
+                del self._by_tag[tag_lower]
+        self._version = _edit_count
+
+    def iter_find_by_tag(self, tag: str) -> Iterator[NoteRow]:
+        """Yield notes that contain the provided tag."""
+        if not tag:
+            return
+        self.__sync()
+        data = self.data
+        for idx in sorted(self._by_tag.get(tag.lower(), ())):
+            note = data[idx]
+            yield (idx + 1, str(note.tags), note.value)
 
     def find_by_tag(self, tag: str):
         """Return notes that contain the provided tag."""
         if not tag:
             return []
-        return [
-            [idx + 1, str(note.tags), note.value]
-            for idx, note in enumerate(self.data)
-            if tag.lower() in note.tags
-        ]
+        self.__sync()
+        key = ("tag", tag.lower())
+        cached = self.__get_cached(key)
+        if cached is not None:
+            return cached
+        return self.__set_cached(key, list(self.iter_find_by_tag(tag)))
 
     def sort_by_tag(self, reverse: bool = False):
         """Return notes sorted by their tags string representation."""
-        return sorted(
-            [
-                [idx + 1, str(note.tags), note.value]
-                for idx, note in enumerate(self.data)
-            ],
-            key=lambda note: note[1],
-            reverse=reverse,
+        data = self.data
+        tag_keys = list(map(str, map(_get_tags, data)))
+        order = sorted(
+            range(len(data)), key=tag_keys.__getitem__, reverse=reverse
         )
+        return [(idx + 1, tag_keys[idx], data[idx].value) for idx in order]
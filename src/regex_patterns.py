@@ -0,0 +1,15 @@
+"""Precompiled regular expressions shared across the assistant bot.
+
+Patterns are compiled once at import time; call their methods directly
+instead of passing raw pattern strings to `re.match`/`re.fullmatch`.
+"""
+
+import re
+
+
+EMAIL_RE = re.compile(
+    r"^[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\Z",
+    re.IGNORECASE,
+)
+PHONE_RE = re.compile(r"\A[0-9]{12}\Z")
+BIRTHDAY_RE = re.compile(r"\A([0-9]{1,2})\.([0-9]{1,2})\.([0-9]{4})\Z")
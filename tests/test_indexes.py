@@ -0,0 +1,253 @@
+"""Check the contact and note indexes against plain linear scans."""
+
+import copy
+import pickle
+import random
+import unittest
+from calendar import isleap
+from datetime import date, timedelta
+
+from src.address_book import AddressBook, Record
+from src.notes import Note, Notes, Tags
+
+_STEPS = 1500
+# Small alphabets so that random queries actually hit something.
+_NAME_CHARS = "abAB"
+_PHONE_DIGITS = "012"
+_WORDS = ("alpha", "Beta", "gamma", "ΣΊΣΥΦΟΣ", "straße", "ab")
+_TAGS = ("work", "Home", "todo", "x")
+
+
+def _scan_search(book, query):
+    """Search contacts by checking every field of every contact."""
+    query_lower = query.lower()
+    return [
+        contact
+        for contact in book.values()
+        if query_lower in contact.name.value.lower()
+        or any(query_lower in phone for phone in contact.phones)
+        or any(query_lower in email for email in contact.emails)
+    ]
+
+
+def _next_birthday(birthday, today, count_days):
+    """Return the first day in the window that celebrates the birthday."""
+    for offset in range(min(count_days, 366) + 1):
+        day = today + timedelta(days=offset)
+        if (day.month, day.day) == (birthday.month, birthday.day):
+            return day
+        if (
+            (birthday.month, birthday.day) == (2, 29)
+            and (day.month, day.day) == (2, 28)
+            and not isleap(day.year)
+        ):
+            return day
+    return None
+
+
+def _scan_birthdays(book, today, count_days):
+    """List (name, date) reminders by walking every contact."""
+    upcoming = []
+    for name, contact in book.items():
+        if contact.birthday is None:
+            continue
+        day = _next_birthday(contact.birthday.value, today, count_days)
+        if day is not None:
+            upcoming.append((name, day))
+    return upcoming
+
+
+def _scan_find(notes, query):
+    """Find notes by case-folded substring over every note."""
+    query_folded = query.casefold()
+    return [
+        (idx, str(note.tags), note.value)
+        for idx, note in enumerate(notes, start=1)
+        if query_folded in note.value.casefold()
+    ]
+
+
+def _scan_find_by_tag(notes, tag):
+    """Find notes by checking the tag set of every note."""
+    return [
+        (idx, str(note.tags), note.value)
+        for idx, note in enumerate(notes, start=1)
+        if tag.lower() in note.tags
+    ]
+
+
+class AddressBookIndexTest(unittest.TestCase):
+    """Randomly mutate address books and compare lookups with scans."""
+
+    def setUp(self):
+        self.rng = random.Random(1)
+
+    def random_name(self):
+        length = self.rng.randint(1, 4)
+        return "".join(self.rng.choice(_NAME_CHARS) for _ in range(length))
+
+    def random_phone(self):
+        return "".join(self.rng.choice(_PHONE_DIGITS) for _ in range(12))
+
+    def random_email(self):
+        return f"{self.random_name()}@{self.rng.choice('ab')}.com"
+
+    def random_birthday(self):
+        if self.rng.random() < 0.1:
+            return "29.02.2000"
+        day = date(1990, 1, 1) + timedelta(days=self.rng.randrange(366 * 3))
+        return f"{day:%d.%m.%Y}"
+
+    def random_record(self):
+        contact = Record(self.random_name())
+        for _ in range(self.rng.randint(0, 2)):
+            contact.add_phone(self.random_phone())
+        for _ in range(self.rng.randint(0, 2)):
+            contact.add_email(self.random_email())
+        if self.rng.random() < 0.5:
+            contact.add_birthday(self.random_birthday())
+        return contact
+
+    def mutate(self, book):
+        """Apply one random change to a book or one of its records."""
+        rng = self.rng
+        action = rng.randrange(10)
+        if action == 0 or not book:
+            contact = self.random_record()
+            book.add_record(contact)
+            return
+        name = rng.choice(list(book))
+        contact = book[name]
+        if action == 1:
+            book.delete(name)
+        elif action == 2:
+            replacement = self.random_record()
+            book[name] = replacement
+        elif action == 3:
+            contact.add_phone(self.random_phone())
+        elif action == 4 and contact.phones:
+            old_phone = rng.choice(list(contact.phones))
+            contact.edit_phone(old_phone, self.random_phone())
+        elif action == 5 and contact.phones:
+            contact.remove_phone(rng.choice(list(contact.phones)))
+        elif action == 6:
+            contact.add_email(self.random_email())
+        elif action == 7 and contact.emails:
+            old_email = rng.choice(list(contact.emails))
+            contact.edit_email(old_email, self.random_email())
+        elif action == 8 and contact.emails:
+            contact.remove_email(rng.choice(list(contact.emails)))
+        else:
+            contact.add_birthday(self.random_birthday())
+
+    def check(self, book):
+        """Compare every indexed lookup of a book with a linear scan."""
+        rng = self.rng
+        for _ in range(3):
+            source = rng.choice(
+                [self.random_name(), self.random_phone(), self.random_email()]
+            )
+            start = rng.randrange(len(source))
+            query = source[start:start + rng.randint(0, 4)]
+            self.assertEqual(book.search(query), _scan_search(book, query))
+        for name in rng.sample(list(book), min(2, len(book))):
+            self.assertIs(book.find(name), dict.get(book, name))
+        today = date(2024, 1, 1) + timedelta(days=rng.randrange(366 * 3))
+        count_days = rng.choice([0, 1, 7, 30, 365, 400])
+        upcoming = book.get_upcoming_birthdays(count_days, today=today)
+        self.assertEqual(
+            [(item.name, item.congratulation_date) for item in upcoming],
+            _scan_birthdays(book, today, count_days),
+        )
+
+    def test_lookups_match_scans_after_mutations(self):
+        book = AddressBook()
+        for _ in range(_STEPS):
+            self.mutate(book)
+            self.check(book)
+
+    def test_copies_keep_their_own_indexes(self):
+        book = AddressBook()
+        for _ in range(200):
+            self.mutate(book)
+        shallow = copy.copy(book)
+        deep = copy.deepcopy(book)
+        restored = pickle.loads(pickle.dumps(book))
+        books = [book, shallow, deep, restored]
+        for _ in range(_STEPS):
+            target = self.rng.choice(books)
+            self.mutate(target)
+            for each in books:
+                self.check(each)
+        # Records are shared only with the shallow copy.
+        for contact in deep.values():
+            self.assertNotIn(contact, book.values())
+
+
+class NotesIndexTest(unittest.TestCase):
+    """Randomly mutate notes and compare lookups with scans."""
+
+    def setUp(self):
+        self.rng = random.Random(2)
+
+    def random_text(self):
+        count = self.rng.randint(1, 3)
+        return " ".join(self.rng.choice(_WORDS) for _ in range(count))
+
+    def mutate(self, notes):
+        """Apply one random change through Notes or to a note directly."""
+        rng = self.rng
+        action = rng.randrange(11)
+        if action < 2 or not notes:
+            notes.add(self.random_text())
+            return
+        index = rng.randrange(-len(notes), len(notes))
+        if action == 2:
+            notes.edit(index, self.random_text())
+        elif action == 3:
+            notes.delete(index)
+        elif action == 4:
+            notes.add_tag(index, rng.choice(_TAGS))
+        elif action == 5:
+            notes.delete_tag(index, rng.choice(_TAGS))
+        elif action == 6:
+            notes[index].value = self.random_text()
+        elif action == 7:
+            notes[index].tags.add(rng.choice(_TAGS))
+        elif action == 8:
+            notes[index].tags = Tags(rng.sample(_TAGS, 2))
+        elif action == 9:
+            notes.insert(index, Note(self.random_text()))
+        else:
+            notes.pop(index)
+
+    def check(self, notes):
+        """Compare every indexed lookup of the notes with a linear scan."""
+        rng = self.rng
+        for _ in range(2):
+            word = rng.choice(_WORDS)
+            start = rng.randrange(len(word))
+            query = word[start:start + rng.randint(1, 4)].upper()
+            self.assertEqual(notes.find(query), _scan_find(notes, query))
+        tag = rng.choice(_TAGS).upper()
+        self.assertEqual(notes.find_by_tag(tag), _scan_find_by_tag(notes, tag))
+
+    def test_lookups_match_scans_after_mutations(self):
+        notes = Notes()
+        for _ in range(_STEPS):
+            self.mutate(notes)
+            self.check(notes)
+
+    def test_copies_see_shared_note_edits(self):
+        notes = Notes()
+        for _ in range(100):
+            self.mutate(notes)
+        copies = [notes, notes.copy(), copy.deepcopy(notes)]
+        for _ in range(_STEPS):
+            self.mutate(self.rng.choice(copies))
+            for each in copies:
+                self.check(each)
+
+
+if __name__ == "__main__":
+    unittest.main()